@@ -70,6 +70,8 @@ def _configure_logging(verbose: int = 0) -> None:
 
 VALID_RELEASE_TAG_VALUES = ("alpha", "beta", "dev", "rc", "post", "final")
 
+_VALID_RELEASE_TAGS = frozenset(VALID_RELEASE_TAG_VALUES)
+
 
 _current_date = dt.date.today().isoformat()
 
@@ -94,7 +96,7 @@ def _validate_release_tag(tag: typ.Optional[str]) -> None:
     if tag is None:
         return
 
-    if tag in VALID_RELEASE_TAG_VALUES:
+    if tag in _VALID_RELEASE_TAGS:
         return
 
     logger.error(f"Invalid argument --tag={tag}")
@@ -207,6 +209,13 @@ fetch_option = click.option(
     help="Sync tags from remote origin.",
 )
 
+force_fetch_option = click.option(
+    "--force-fetch",
+    is_flag=True,
+    default=False,
+    help=f"Sync tags, even if the last sync was less than {vcs.FETCH_MAX_AGE} seconds ago.",
+)
+
 
 # env_option is depricated in favour of --environ
 # see https://github.com/mbarkhau/bumpver/issues/224
@@ -347,10 +356,17 @@ def test(
 
 def _grep_text(pattern: patterns.Pattern, text: str, color: bool) -> typ.Iterable[str]:
     all_lines = text.splitlines()
+
+    # matches are in order, so newlines are counted incrementally
+    # rather than from the start of the text for every match
+    line_idx     = 0
+    counted_upto = 0
     for match in pattern.regexp.finditer(text):
         match_start, match_end = match.span()
 
-        line_idx   = text[:match_start].count("\n")
+        line_idx    += text.count("\n", counted_upto, match_start)
+        counted_upto = match_start
+
         line_start = text.rfind("\n", 0, match_start) + 1
         line_end   = text.find("\n", match_end, -1)
         if color:
@@ -452,12 +468,14 @@ def grep(
 @verbose_option
 @ignore_vcs_tag_option
 @fetch_option
+@force_fetch_option
 @env_option
 @environ_option
 def show(
     verbose       : int = 0,
     ignore_vcs_tag: bool = False,
     fetch         : bool = True,
+    force_fetch   : bool = False,
     env           : bool = False,
     environ       : bool = False,
 ) -> None:
@@ -470,6 +488,8 @@ def show(
         logger.error("Could not parse configuration. Perhaps try 'bumpver init'.")
         sys.exit(1)
 
+    fetch = _parse_fetch_options(fetch, force_fetch)
+
     if not ignore_vcs_tag:
         cfg = _update_cfg_from_vcs(cfg, fetch)
 
@@ -492,51 +512,73 @@ def show(
         click.echo(f"PEP440         : {cfg.pep440_version}")
 
 
+_DIFF_COLOR_BY_PREFIX = {
+    "+": "\u001b[32m",
+    "-": "\u001b[31m",
+    "@": "\u001b[36m",
+}
+
+_DIFF_HEADER_PREFIXES = ("+++", "---")
+
+
 def _colored_diff_lines(diff: str) -> typ.Iterable[str]:
+    r"""Add ansi colors to lines of a unified diff.
+
+    >>> list(_colored_diff_lines("--- a\n+++ a\n@@ -1 +1 @@\n-foo\n+bar\n baz"))
+    ['--- a', '+++ a', '\x1b[36m@@ -1 +1 @@\x1b[0m', '\x1b[31m-foo\x1b[0m', '\x1b[32m+bar\x1b[0m', ' baz']
+    """
     for line in diff.splitlines():
-        if line.startswith("+++") or line.startswith("---"):
+        color = _DIFF_COLOR_BY_PREFIX.get(line[:1])
+        if color is None or line[:3] in _DIFF_HEADER_PREFIXES:
             yield line
-        elif line.startswith("+"):
-            yield "\u001b[32m" + line + "\u001b[0m"
-        elif line.startswith("-"):
-            yield "\u001b[31m" + line + "\u001b[0m"
-        elif line.startswith("@"):
-            yield "\u001b[36m" + line + "\u001b[0m"
         else:
-            yield line
+            yield color + line + "\u001b[0m"
 
 
-def _v2_get_diff(cfg: config.Config, new_version: str) -> str:
+MaybeRewrittenFiles = typ.Optional[typ.List[rewrite.RewrittenFileData]]
+
+
+def _v2_get_diff(cfg: config.Config, new_version: str, rfds: MaybeRewrittenFiles = None) -> str:
     old_vinfo = v2version.parse_version_info(cfg.current_version, cfg.version_pattern)
     new_vinfo = v2version.parse_version_info(new_version, cfg.version_pattern)
-    return v2rewrite.diff(old_vinfo, new_vinfo, cfg.file_patterns)
+    return v2rewrite.diff(old_vinfo, new_vinfo, cfg.file_patterns, rfds)
 
 
-def _v1_get_diff(cfg: config.Config, new_version: str) -> str:
+def _v1_get_diff(cfg: config.Config, new_version: str, rfds: MaybeRewrittenFiles = None) -> str:
     old_vinfo = v1version.parse_version_info(cfg.current_version, cfg.version_pattern)
     new_vinfo = v1version.parse_version_info(new_version, cfg.version_pattern)
-    return v1rewrite.diff(old_vinfo, new_vinfo, cfg.file_patterns)
+    return v1rewrite.diff(old_vinfo, new_vinfo, cfg.file_patterns, rfds)
 
 
-def get_diff(cfg, new_version) -> str:
+def get_diff(cfg, new_version, rfds: MaybeRewrittenFiles = None) -> str:
     if cfg.is_new_pattern:
-        return _v2_get_diff(cfg, new_version)
+        return _v2_get_diff(cfg, new_version, rfds)
     else:
-        return _v1_get_diff(cfg, new_version)
+        return _v1_get_diff(cfg, new_version, rfds)
+
+
+def _rewritten_files(cfg: config.Config, new_version: str) -> typ.List[rewrite.RewrittenFileData]:
+    if cfg.is_new_pattern:
+        new_v2_vinfo = v2version.parse_version_info(new_version, cfg.version_pattern)
+        return v2rewrite.rewritten_files(cfg.file_patterns, new_v2_vinfo)
+    else:
+        new_v1_vinfo = v1version.parse_version_info(new_version, cfg.version_pattern)
+        return v1rewrite.rewritten_files(cfg.file_patterns, new_v1_vinfo)
 
 
 def _print_diff_str(diff: str) -> None:
-    colored_diff = "\n".join(_colored_diff_lines(diff))
     if sys.stdout.isatty():
-        click.echo(colored_diff)
+        click.echo("\n".join(_colored_diff_lines(diff)))
     else:
         click.echo(diff)
 
 
-def _print_diff(cfg: config.Config, new_version: str) -> None:
+def _print_diff(cfg: config.Config, new_version: str) -> typ.List[rewrite.RewrittenFileData]:
     try:
-        diff = get_diff(cfg, new_version)
+        rfds = _rewritten_files(cfg, new_version)
+        diff = get_diff(cfg, new_version, rfds)
         _print_diff_str(diff)
+        return rfds
     except OSError as err:
         logger.error(str(err))
         sys.exit(1)
@@ -545,9 +587,33 @@ def _print_diff(cfg: config.Config, new_version: str) -> None:
         sys.exit(1)
 
 
+# Lowercase characters are literals in both v1 and v2 patterns.
+_LITERAL_PREFIX_RE = re.compile(r"[a-z]*")
+
+
+def _literal_prefix(version_pattern: str) -> str:
+    """Leading characters which every version of a pattern starts with.
+
+    >>> _literal_prefix("vYYYY0M.BUILD[-TAG]")
+    'v'
+    >>> _literal_prefix("v{year}{month}.{build}")
+    'v'
+    >>> _literal_prefix("MAJOR.MINOR.PATCH")
+    ''
+    """
+    match = _LITERAL_PREFIX_RE.match(version_pattern)
+    return match.group() if match else ""
+
+
 def _parse_version_tags(all_tags: typ.List[str], version_pattern: str, is_new_pattern: bool) -> typ.List[str]:
     version_parser = v2version if is_new_pattern else v1version
-    return [tag for tag in all_tags if version_parser.is_valid(tag, version_pattern)]
+    # cheap rejection of unrelated tags before the regex based validation
+    prefix = _literal_prefix(version_pattern)
+    return [
+        tag
+        for tag in all_tags
+        if tag.startswith(prefix) and version_parser.is_valid(tag, version_pattern)
+    ]
 
 
 def _is_valid_version(raw_pattern: str, old_version: str, new_version: str, unique: bool = False) -> bool:
@@ -637,6 +703,7 @@ def _update(
     commit_message: str,
     tag_message   : str,
     allow_dirty   : bool = False,
+    rfds          : MaybeRewrittenFiles = None,
 ) -> None:
     vcs_api: typ.Optional[vcs.VCSAPI] = None
 
@@ -654,10 +721,10 @@ def _update(
     try:
         if cfg.is_new_pattern:
             new_v2_vinfo = v2version.parse_version_info(new_version, cfg.version_pattern)
-            v2rewrite.rewrite_files(cfg.file_patterns, new_v2_vinfo)
+            v2rewrite.rewrite_files(cfg.file_patterns, new_v2_vinfo, rfds)
         else:
             new_v1_vinfo = v1version.parse_version_info(new_version, cfg.version_pattern)
-            v1rewrite.rewrite_files(cfg.file_patterns, new_v1_vinfo)
+            v1rewrite.rewrite_files(cfg.file_patterns, new_v1_vinfo, rfds)
     except rewrite.NoPatternMatch as ex:
         logger.error(str(ex))
         sys.exit(1)
@@ -672,9 +739,10 @@ def _try_update(
     commit_message: str,
     tag_message   : str,
     allow_dirty   : bool = False,
+    rfds          : MaybeRewrittenFiles = None,
 ) -> None:
     try:
-        _update(cfg, new_version, commit_message, tag_message, allow_dirty)
+        _update(cfg, new_version, commit_message, tag_message, allow_dirty, rfds)
     except sp.CalledProcessError as ex:
         logger.error(f"Error running subcommand: {ex.cmd}")
         if ex.stdout:
@@ -711,14 +779,30 @@ def get_latest_vcs_version_tag(cfg: config.Config, fetch: bool) -> typ.Optional[
     version_tags = _parse_version_tags(all_tags, cfg.version_pattern, cfg.is_new_pattern)
 
     if version_tags:
-        version_tags.sort(key=version.parse_version, reverse=True)
-        _debug_tags = ", ".join(version_tags[:3])
-        logger.debug(f"found tags: {_debug_tags} ... ({len(version_tags)} in total)")
-        return version_tags[0]
+        latest_version_tag = max(version_tags, key=version.parse_version)
+        logger.debug(f"latest tag: {latest_version_tag} ({len(version_tags)} tags in total)")
+        return latest_version_tag
     else:
         return None
 
 
+def _clear_fetch_timestamp() -> None:
+    try:
+        vcs.get_vcs_api().clear_fetch_timestamp()
+    except OSError:
+        pass  # no vcs, nothing to fetch
+
+
+def _parse_fetch_options(fetch: bool, force_fetch: bool) -> bool:
+    if force_fetch and not fetch:
+        logger.warning("Invalid argument: --force-fetch and --no-fetch cannot be used at the same time")
+        sys.exit(1)
+
+    if force_fetch:
+        _clear_fetch_timestamp()
+    return fetch
+
+
 def _update_cfg_from_vcs(cfg: config.Config, fetch: bool) -> config.Config:
     latest_version_tag = get_latest_vcs_version_tag(cfg, fetch)
 
@@ -788,6 +872,7 @@ def _sub_msg_template(message: str) -> str:
 @allow_dirty_option
 @ignore_vcs_tag_option
 @fetch_option
+@force_fetch_option
 @verbose_option
 @version_options
 @click.option(
@@ -842,6 +927,7 @@ def update(
     allow_dirty     : bool = False,
     ignore_vcs_tag  : bool = False,
     fetch           : bool = True,
+    force_fetch     : bool = False,
     verbose         : int = 0,
     major           : bool = False,
     minor           : bool = False,
@@ -879,6 +965,8 @@ def update(
         logger.warning(f"Invalid argument: {ex}")
         sys.exit(1)
 
+    fetch = _parse_fetch_options(fetch, force_fetch)
+
     if not ignore_vcs_tag:
         cfg = _update_cfg_from_vcs(cfg, fetch)
 
@@ -913,8 +1001,9 @@ def update(
     logger.info(f"Old Version: {old_version}")
     logger.info(f"New Version: {new_version}")
 
+    rfds: MaybeRewrittenFiles = None
     if dry or verbose >= 2:
-        _print_diff(cfg, new_version)
+        rfds = _print_diff(cfg, new_version)
 
     if commit_message is None:
         commit_msg_template = cfg.commit_message
@@ -938,7 +1027,7 @@ def update(
     if dry:
         return
 
-    _try_update(cfg, new_version, try_commit_message, try_tag_message, allow_dirty)
+    _try_update(cfg, new_version, try_commit_message, try_tag_message, allow_dirty, rfds)
 
 
 if __name__ == '__main__':
@@ -5,13 +5,13 @@
 # SPDX-License-Identifier: MIT
 """Parse bumpver.toml, setup.cfg or pyproject.toml files."""
 
+import io
+import os
 import re
 import enum
 import typing as typ
 import logging
-import configparser
-
-import toml
+import collections
 
 from bumpver import pathlib as pl
 
@@ -61,9 +61,18 @@ class ProjectContext(typ.NamedTuple):
     config_rel_path: str
     config_format  : str
     vcs_type       : typ.Optional[str]
+    dir_entries    : typ.FrozenSet[str]
+
 
+def _dir_entries(path: pl.Path) -> typ.FrozenSet[str]:
+    # A single directory listing instead of an exists() stat per candidate file.
+    try:
+        return frozenset(os.listdir(str(path)))
+    except OSError:
+        return frozenset()
 
-def _pick_config_filepath(path: pl.Path) -> pl.Path:
+
+def _pick_config_filepath(path: pl.Path, entries: typ.FrozenSet[str]) -> pl.Path:
     config_candidates: typ.List[pl.Path] = [
         path / "pycalver.toml",
         path / "bumpver.toml",
@@ -75,7 +84,7 @@ def _pick_config_filepath(path: pl.Path) -> pl.Path:
     # Prefer to use a config which contains a bumpver and current_version
     # This means a project can have multiple different configs.
     for config_filepath in config_candidates:
-        if config_filepath.exists():
+        if config_filepath.name in entries:
             with config_filepath.open(mode="rb") as fobj:
                 data = fobj.read()
 
@@ -86,15 +95,15 @@ def _pick_config_filepath(path: pl.Path) -> pl.Path:
     # Next pick whatever config happens to exist, even if it
     # doesn't have a [bumpver] section (yet).
     for config_filepath in config_candidates:
-        if config_filepath.exists():
+        if config_filepath.name in entries:
             return config_filepath
 
     # fallback to creating a new bumpver.toml
     return path / "bumpver.toml"
 
 
-def _parse_config_and_format(path: pl.Path) -> typ.Tuple[pl.Path, str, str]:
-    config_filepath = _pick_config_filepath(path)
+def _parse_config_and_format(path: pl.Path, entries: typ.FrozenSet[str]) -> typ.Tuple[pl.Path, str, str]:
+    config_filepath = _pick_config_filepath(path, entries)
 
     if config_filepath.is_absolute():
         config_rel_path = str(config_filepath.relative_to(path.absolute()))
@@ -116,18 +125,20 @@ def init_project_ctx(project_path: typ.Union[str, pl.Path, None] = ".") -> Proje
         # assume it's coercable to str/unicode
         path = pl.Path(str(project_path))
 
-    config_filepath, config_rel_path, config_format = _parse_config_and_format(path)
+    entries = _dir_entries(path)
+
+    config_filepath, config_rel_path, config_format = _parse_config_and_format(path, entries)
 
     vcs_type: typ.Optional[str]
 
-    if (path / ".git").exists():
+    if ".git" in entries:
         vcs_type = 'git'
-    elif (path / ".hg").exists():
+    elif ".hg" in entries:
         vcs_type = 'hg'
     else:
         vcs_type = None
 
-    return ProjectContext(path, config_filepath, config_rel_path, config_format, vcs_type)
+    return ProjectContext(path, config_filepath, config_rel_path, config_format, vcs_type, entries)
 
 
 RawConfig      = typ.Dict[str, typ.Any]
@@ -184,56 +195,109 @@ def _debug_str(cfg: Config) -> str:
     return "".join(cfg_str_parts)
 
 
-def _parse_cfg_file_patterns(
-    cfg_parser: configparser.RawConfigParser,
-) -> typ.Iterable[FileRawPatternsItem]:
-    file_pattern_items: typ.List[typ.Tuple[str, str]]
+_CFG_SECTION_RE = re.compile(r"\[(?P<header>.+)\]")
+_CFG_OPTION_RE  = re.compile(r"(?P<option>.*?)\s*[=:]\s*(?P<value>.*)$")
+
+_CFG_COMMENT_PREFIXES = ("#", ";")
+_CFG_DEFAULT_SECTION  = "DEFAULT"
+
+
+class _ConfigParser:
+    """Minimal parser for the subset of RawConfigParser used by bumpver.
+
+    Options are 'key = value' or 'key: value', comments are only
+    recognized on their own line and lines that are indented further
+    than the option are continuations of its value. Unlike
+    RawConfigParser, option names are not converted to lowercase.
+    This is important because our option names are actually
+    filenames, so case sensitivity is relevant.
+    """
+
+    def __init__(self) -> None:
+        self._sections: typ.Dict[str, typ.Dict[str, typ.List[str]]] = {}
+
+    def read_file(self, lines: typ.Iterable[str]) -> None:
+        section    : typ.Optional[typ.Dict[str, typ.List[str]]] = None
+        value_lines: typ.Optional[typ.List[str]] = None
+        indent_level = 0
+
+        for lineno, line in enumerate(lines, start=1):
+            stripped = line.strip()
+            if stripped.startswith(_CFG_COMMENT_PREFIXES):
+                continue
+
+            if not stripped:
+                if value_lines is not None:
+                    value_lines.append("")
+                continue
+
+            cur_indent_level = len(line) - len(line.lstrip())
+            if value_lines is not None and cur_indent_level > indent_level:
+                value_lines.append(stripped)
+                continue
+
+            indent_level = cur_indent_level
+
+            section_match = _CFG_SECTION_RE.match(stripped)
+            if section_match:
+                section_name = section_match.group('header')
+                if section_name in self._sections:
+                    raise ValueError(f"Duplicate section [{section_name}] on line {lineno}")
+                section     = self._sections[section_name] = {}
+                value_lines = None
+                continue
+
+            option_match = _CFG_OPTION_RE.match(stripped)
+            if section is None:
+                raise ValueError(f"Missing section header before line {lineno}: {stripped}")
+            if option_match is None or not option_match.group('option'):
+                raise ValueError(f"Invalid syntax on line {lineno}: {stripped}")
+
+            option = option_match.group('option')
+            if option in section:
+                raise ValueError(f"Duplicate option '{option}' on line {lineno}")
+            value_lines = section[option] = [option_match.group('value')]
+
+    def has_section(self, section_name: str) -> bool:
+        return section_name != _CFG_DEFAULT_SECTION and section_name in self._sections
+
+    def section(self, section_name: str) -> RawConfig:
+        options = dict(self._sections.get(_CFG_DEFAULT_SECTION, {}))
+        options.update(self._sections[section_name])
+        return {option: "\n".join(value_lines).rstrip() for option, value_lines in options.items()}
+
+
+def _parse_cfg_file_patterns(cfg_parser: _ConfigParser) -> typ.Iterable[FileRawPatternsItem]:
+    file_patterns_section: typ.Dict[str, str]
 
     if cfg_parser.has_section("pycalver:file_patterns"):
-        file_pattern_items = cfg_parser.items("pycalver:file_patterns")
+        file_patterns_section = cfg_parser.section("pycalver:file_patterns")
     elif cfg_parser.has_section("bumpver:file_patterns"):
-        file_pattern_items = cfg_parser.items("bumpver:file_patterns")
+        file_patterns_section = cfg_parser.section("bumpver:file_patterns")
     else:
         return
 
-    for filepath, patterns_str in file_pattern_items:
-        maybe_patterns = (line.strip() for line in patterns_str.splitlines())
-        patterns       = [p for p in maybe_patterns if p]
+    for filepath, patterns_str in file_patterns_section.items():
+        patterns = list(filter(None, map(str.strip, patterns_str.splitlines())))
         yield filepath, patterns
 
 
-class _ConfigParser(configparser.RawConfigParser):
-    # pylint:disable=too-many-ancestors ; from our perspective, it's just one
-    """Custom parser, simply to override optionxform behaviour."""
-
-    def optionxform(self, optionstr: str) -> str:
-        """Non-xforming (ie. uppercase preserving) override.
-
-        This is important because our option names are actually
-        filenames, so case sensitivity is relevant. The default
-        behaviour is to do optionstr.lower()
-        """
-        return optionstr
-
-
 OptionVal = typ.Union[str, bool, None]
 
 BOOL_OPTIONS: typ.Mapping[str, OptionVal] = {'commit': False, 'tag': None, 'push': None}
 
+_TRUE_STRS = frozenset(["yes", "true", "1", "on"])
+
 
 def _parse_cfg(cfg_buffer: typ.IO[str]) -> RawConfig:
     cfg_parser = _ConfigParser()
-
-    if hasattr(cfg_parser, 'read_file'):
-        cfg_parser.read_file(cfg_buffer)
-    else:
-        cfg_parser.readfp(cfg_buffer)  # pylint: disable=deprecated-method ; python2 compat
+    cfg_parser.read_file(cfg_buffer)
 
     raw_cfg: RawConfig
     if cfg_parser.has_section("pycalver"):
-        raw_cfg = dict(cfg_parser.items("pycalver"))
+        raw_cfg = cfg_parser.section("pycalver")
     elif cfg_parser.has_section("bumpver"):
-        raw_cfg = dict(cfg_parser.items("bumpver"))
+        raw_cfg = cfg_parser.section("bumpver")
     else:
         logger.warning("Perhaps try 'bumpver init'.")
         raise ValueError("Missing [bumpver] section.")
@@ -241,7 +305,7 @@ def _parse_cfg(cfg_buffer: typ.IO[str]) -> RawConfig:
     for option, default_val in BOOL_OPTIONS.items():
         val: OptionVal = raw_cfg.get(option, default_val)
         if isinstance(val, (bytes, str)):
-            val = val.lower() in ("yes", "true", "1", "on")
+            val = val.lower() in _TRUE_STRS
         raw_cfg[option] = val
 
     raw_cfg['file_patterns'] = dict(_parse_cfg_file_patterns(cfg_parser))
@@ -251,8 +315,23 @@ def _parse_cfg(cfg_buffer: typ.IO[str]) -> RawConfig:
     return raw_cfg
 
 
+def _loads_toml(cfg_text: str) -> typ.Any:
+    # imports deferred: projects with a setup.cfg never need a toml parser
+    # pylint:disable=import-outside-toplevel
+    try:
+        import tomllib  # python >= 3.11
+    except ImportError:
+        try:
+            import tomli as tomllib  # type: ignore[no-redef]
+        except ImportError:
+            # python < 3.7
+            import toml as tomllib  # type: ignore[no-redef]
+
+    return tomllib.loads(cfg_text)
+
+
 def _parse_toml(cfg_buffer: typ.IO[str]) -> RawConfig:
-    raw_full_cfg: typ.Any = toml.load(cfg_buffer)
+    raw_full_cfg: typ.Any = _loads_toml(cfg_buffer.read())
     raw_cfg     : RawConfig
 
     if 'tool' in raw_full_cfg and 'bumpver' in raw_full_cfg['tool']:
@@ -312,6 +391,7 @@ def _compile_v2_file_patterns(raw_cfg: RawConfig) -> typ.Iterable[FilePatternsIt
     raw_patterns_by_file: RawPatternsByFile = raw_cfg['file_patterns']
 
     for filepath, raw_patterns in _iter_glob_expanded_file_patterns(raw_patterns_by_file):
+        compiled_patterns: typ.List[Pattern] = []
         for raw_pattern in raw_patterns:
             if raw_pattern.startswith("["):
                 errmsg = (
@@ -320,14 +400,13 @@ def _compile_v2_file_patterns(raw_cfg: RawConfig) -> typ.Iterable[FilePatternsIt
                 )
                 raise ValueError(errmsg)
 
-            # provoke error for specifc pattern
+            # compile individually, to provoke error for specifc pattern
             try:
-                v2patterns.compile_pattern(version_pattern, raw_pattern)
+                compiled_patterns.append(v2patterns.compile_pattern(version_pattern, raw_pattern))
             except re.error:
                 logger.warning(f"Invalid patterns for {filepath} ({raw_pattern})")
                 raise
 
-        compiled_patterns = v2patterns.compile_patterns(version_pattern, raw_patterns)
         yield filepath, compiled_patterns
 
 
@@ -342,13 +421,13 @@ def _compile_file_patterns(raw_cfg: RawConfig, is_new_pattern: bool) -> Patterns
     #
     # return dict(_file_pattern_items)
 
-    file_patterns: PatternsByFile = {}
+    file_patterns: PatternsByFile = collections.defaultdict(list)
     for path, patterns in _file_pattern_items:
-        if path in file_patterns:
-            file_patterns[path].extend(patterns)
-        else:
-            file_patterns[path] = patterns
-    return file_patterns
+        file_patterns[path].extend(patterns)
+    return dict(file_patterns)
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
 
 
 def _validate_version_with_pattern(
@@ -371,10 +450,10 @@ def _validate_version_with_pattern(
         raise ValueError(errmsg)
 
     if is_new_pattern:
-        invalid_chars = re.search(r"([\s]+)", version_pattern)
+        invalid_chars = _WHITESPACE_RE.search(version_pattern)
         if invalid_chars:
             errmsg = (
-                f"Invalid character(s) '{invalid_chars.group(1)}'"
+                f"Invalid character(s) '{invalid_chars.group()}'"
                 f' in version_pattern = "{version_pattern}"'
             )
             raise ValueError(errmsg)
@@ -417,14 +496,10 @@ def _parse_config(raw_cfg: RawConfig) -> Config:
     pre_commit_hook : str = _parse_cfg_strings(raw_cfg, 'pre_commit_hook' , "")
     post_commit_hook: str = _parse_cfg_strings(raw_cfg, 'post_commit_hook', "")
 
+    # tag and push default to None (unset), which is the same as False
     commit = raw_cfg['commit']
-    tag    = raw_cfg['tag']
-    push   = raw_cfg['push']
-
-    if tag is None:
-        tag = raw_cfg['tag'] = False
-    if push is None:
-        push = raw_cfg['push'] = False
+    tag    = raw_cfg['tag' ] = raw_cfg['tag' ] or False
+    push   = raw_cfg['push'] = raw_cfg['push'] or False
 
     if tag and not commit:
         raise ValueError("commit=True required if tag=True")
@@ -458,64 +533,66 @@ def _parse_config(raw_cfg: RawConfig) -> Config:
         is_new_pattern=is_new_pattern,
         file_patterns=file_patterns,
     )
-    logger.debug(_debug_str(cfg))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(_debug_str(cfg))
     return cfg
 
 
-def _parse_current_version_default_pattern(raw_cfg: RawConfig, raw_cfg_text: str) -> str:
-    is_config_section = False
-    for line in raw_cfg_text.splitlines():
-        if is_config_section and line.startswith("current_version"):
-            current_version: str = raw_cfg['current_version']
-            version_pattern: str = raw_cfg['version_pattern']
-            return line.replace(current_version, version_pattern)
+_CURRENT_VERSION_LINE_RE = re.compile(
+    r"""
+    ^[^\S\n]*\[(?:pycalver|bumpver|tool\.bumpver)\][^\S\n]*$  # config section header
+    (?:\n(?!\[.*\]$).*)*?                                     # other lines of the section
+    \n(?P<line>current_version.*)$
+    """,
+    flags=re.MULTILINE | re.VERBOSE,
+)
 
-        if line.strip() == "[pycalver]":
-            is_config_section = True
-        elif line.strip() == "[bumpver]":
-            is_config_section = True
-        elif line.strip() == "[tool.bumpver]":
-            is_config_section = True
-        elif line and line[0] == "[" and line[-1] == "]":
-            is_config_section = False
 
-    raise ValueError("Could not parse 'current_version'")
+def _parse_current_version_default_pattern(raw_cfg: RawConfig, raw_cfg_text: str) -> str:
+    match = _CURRENT_VERSION_LINE_RE.search(raw_cfg_text)
+    if match is None:
+        raise ValueError("Could not parse 'current_version'")
+
+    current_version: str = raw_cfg['current_version']
+    version_pattern: str = raw_cfg['version_pattern']
+    return match.group('line').replace(current_version, version_pattern)
 
 
 def _set_raw_config_defaults(raw_cfg: RawConfig) -> None:
-    if 'version_pattern' not in raw_cfg:
+    version_pattern = raw_cfg.get('version_pattern')
+    if version_pattern is None:
         raise TypeError("Missing version_pattern")
-    elif not isinstance(raw_cfg['version_pattern'], str):
-        err = f"Invalid type for version_pattern = {raw_cfg['version_pattern']}"
+    elif not isinstance(version_pattern, str):
+        err = f"Invalid type for version_pattern = {version_pattern}"
         raise TypeError(err)
 
-    if 'current_version' not in raw_cfg:
+    current_version = raw_cfg.get('current_version')
+    if current_version is None:
         raise ValueError("Missing 'current_version' configuration")
-    elif not isinstance(raw_cfg['current_version'], str):
-        err = f"Invalid type for current_version = {raw_cfg['current_version']}"
+    elif not isinstance(current_version, str):
+        err = f"Invalid type for current_version = {current_version}"
         raise TypeError(err)
 
-    if 'file_patterns' not in raw_cfg:
-        raw_cfg['file_patterns'] = {}
+    raw_cfg.setdefault('file_patterns', {})
 
 
 def _parse_raw_config(ctx: ProjectContext) -> RawConfig:
+    # read the file in one go, the text is reused for the default pattern
     with ctx.config_filepath.open(mode="rt", encoding="utf-8") as fobj:
-        if ctx.config_format == 'toml':
-            raw_cfg = _parse_toml(fobj)
-        elif ctx.config_format == 'cfg':
-            raw_cfg = _parse_cfg(fobj)
-        else:
-            err_msg = (
-                f"Invalid config_format='{ctx.config_format}'."
-                "Supported formats are 'setup.cfg' and 'pyproject.toml'"
-            )
-            raise RuntimeError(err_msg)
+        raw_cfg_text = fobj.read()
 
-    if ctx.config_rel_path not in raw_cfg['file_patterns']:
-        with ctx.config_filepath.open(mode="rt", encoding="utf-8") as fobj:
-            raw_cfg_text = fobj.read()
+    if ctx.config_format == 'toml':
+        raw_cfg = _parse_toml(io.StringIO(raw_cfg_text))
+    elif ctx.config_format == 'cfg':
+        raw_cfg = _parse_cfg(io.StringIO(raw_cfg_text))
+    else:
+        err_msg = (
+            f"Invalid config_format='{ctx.config_format}'."
+            "Supported formats are 'setup.cfg' and 'pyproject.toml'"
+        )
+        raise RuntimeError(err_msg)
 
+    if ctx.config_rel_path not in raw_cfg['file_patterns']:
         # NOTE (mb 2020-09-19): By default we always add
         #   a pattern for the config section itself.
         raw_version_pattern = _parse_current_version_default_pattern(raw_cfg, raw_cfg_text)
@@ -677,63 +754,93 @@ DEFAULT_TOML_README_MD_STR = """
 """.lstrip()
 
 
+DEFAULT_CONFIGPARSER_STRS_BY_FILENAME = {
+    "setup.cfg" : DEFAULT_CONFIGPARSER_SETUP_CFG_STR,
+    "setup.py"  : DEFAULT_CONFIGPARSER_SETUP_PY_STR,
+    "README.rst": DEFAULT_CONFIGPARSER_README_RST_STR,
+    "README.md" : DEFAULT_CONFIGPARSER_README_MD_STR,
+}
+
+
+DEFAULT_TOML_STRS_BY_FILENAME = {
+    "pyproject.toml": DEFAULT_TOML_PYPROJECT_STR,
+    "pycalver.toml" : DEFAULT_TOML_PYCALVER_STR,
+    "bumpver.toml"  : DEFAULT_TOML_BUMPVER_STR,
+    ".bumpver.toml" : DEFAULT_TOML_DOT_BUMPVER_STR,
+    "setup.py"      : DEFAULT_TOML_SETUP_PY_STR,
+    "README.rst"    : DEFAULT_TOML_README_RST_STR,
+    "README.md"     : DEFAULT_TOML_README_MD_STR,
+}
+
+
 def _initial_version() -> str:
-    return utils.now().strftime("%Y.1001-alpha")
+    return f"{utils.now().year}.1001-alpha"
 
 
 def _initial_version_pep440() -> str:
-    return utils.now().strftime("%Y.1001a0")
+    return f"{utils.now().year}.1001a0"
 
 
-def default_config(ctx: ProjectContext) -> str:
-    """Generate initial default config."""
-    fmt = ctx.config_format
+@utils.memo
+def _default_config(
+    fmt            : str,
+    config_filename: str,
+    filenames      : typ.Tuple[str, ...],
+    initial_version: str,
+) -> str:
     if fmt == 'cfg':
         base_tmpl = DEFAULT_CONFIGPARSER_BASE_TMPL
-
-        default_pattern_strs_by_filename = {
-            "setup.cfg" : DEFAULT_CONFIGPARSER_SETUP_CFG_STR,
-            "setup.py"  : DEFAULT_CONFIGPARSER_SETUP_PY_STR,
-            "README.rst": DEFAULT_CONFIGPARSER_README_RST_STR,
-            "README.md" : DEFAULT_CONFIGPARSER_README_MD_STR,
-        }
+        default_pattern_strs_by_filename = DEFAULT_CONFIGPARSER_STRS_BY_FILENAME
     elif fmt == 'toml':
-        if ctx.config_filepath.name == "pyproject.toml":
+        if config_filename == "pyproject.toml":
             base_tmpl = DEFAULT_PYPROJECT_TOML_BASE_TMPL
         else:
             base_tmpl = DEFAULT_BUMPVER_TOML_BASE_TMPL
 
-        default_pattern_strs_by_filename = {
-            "pyproject.toml": DEFAULT_TOML_PYPROJECT_STR,
-            "pycalver.toml" : DEFAULT_TOML_PYCALVER_STR,
-            "bumpver.toml"  : DEFAULT_TOML_BUMPVER_STR,
-            ".bumpver.toml" : DEFAULT_TOML_DOT_BUMPVER_STR,
-            "setup.py"      : DEFAULT_TOML_SETUP_PY_STR,
-            "README.rst"    : DEFAULT_TOML_README_RST_STR,
-            "README.md"     : DEFAULT_TOML_README_MD_STR,
-        }
+        default_pattern_strs_by_filename = DEFAULT_TOML_STRS_BY_FILENAME
     else:
         raise ValueError(f"Invalid config_format='{fmt}', must be either 'toml' or 'cfg'.")
 
-    cfg_str = base_tmpl.format(
-        initial_version=_initial_version(),
-        default_tag_scope=DEFAULT_TAG_SCOPE.value,
-    )
+    cfg_str_parts = [
+        base_tmpl.format(
+            initial_version=initial_version,
+            default_tag_scope=DEFAULT_TAG_SCOPE.value,
+        )
+    ]
 
     for filename, default_str in default_pattern_strs_by_filename.items():
-        if (ctx.path / filename).exists():
-            cfg_str += default_str
+        if filename in filenames:
+            cfg_str_parts.append(default_str)
 
-    has_config_file = any((ctx.path / fn).exists() for fn in SUPPORTED_CONFIGS)
+    has_config_file = any(fn in filenames for fn in SUPPORTED_CONFIGS)
 
     if not has_config_file:
-        if ctx.config_format == 'cfg':
-            cfg_str += DEFAULT_CONFIGPARSER_SETUP_CFG_STR
-        if ctx.config_format == 'toml':
-            cfg_str += DEFAULT_TOML_BUMPVER_STR
+        if fmt == 'cfg':
+            cfg_str_parts.append(DEFAULT_CONFIGPARSER_SETUP_CFG_STR)
+        if fmt == 'toml':
+            cfg_str_parts.append(DEFAULT_TOML_BUMPVER_STR)
 
-    cfg_str += "\n"
+    cfg_str_parts.append("\n")
 
+    return "".join(cfg_str_parts)
+
+
+_DEFAULT_CONFIG_FILENAMES = (
+    set(SUPPORTED_CONFIGS)
+    | set(DEFAULT_CONFIGPARSER_STRS_BY_FILENAME)
+    | set(DEFAULT_TOML_STRS_BY_FILENAME)
+)
+
+
+def default_config(ctx: ProjectContext) -> str:
+    """Generate initial default config."""
+    filenames = tuple(sorted(_DEFAULT_CONFIG_FILENAMES & ctx.dir_entries))
+    cfg_str: str = _default_config(
+        ctx.config_format,
+        ctx.config_filepath.name,
+        filenames,
+        _initial_version(),
+    )
     return cfg_str
 
 
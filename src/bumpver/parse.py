@@ -5,8 +5,10 @@
 # SPDX-License-Identifier: MIT
 """Parse PyCalVer strings from files."""
 
+import re
 import typing as typ
 
+from . import utils
 from .patterns import Pattern
 
 LineNo = int
@@ -52,14 +54,147 @@ class PatternMatch(typ.NamedTuple):
 PatternMatches = typ.Iterable[PatternMatch]
 
 
-def _iter_for_pattern(lines: typ.List[str], pattern: Pattern) -> PatternMatches:
-    for lineno, line in enumerate(lines):
+NumberedLines = typ.Iterable[typ.Tuple[LineNo, str]]
+
+
+_NAMED_GROUP_RE = re.compile(r"\(\?P<\w+>")
+_DEFAULT_FLAGS  = re.compile("").flags
+
+
+_RE_SPECIAL_CHARS = set("()[]{}?*+|^$.")
+_RE_QUANTIFIERS   = set("?*{")
+
+
+def _has_toplevel_alternation(regexp_str: str) -> bool:
+    r"""Check for a '|' which is not nested in a group or char class.
+
+    >>> _has_toplevel_alternation(r"a(b|c)")
+    False
+    >>> _has_toplevel_alternation(r"a(b)|c")
+    True
+    >>> _has_toplevel_alternation(r"a[|]\|")
+    False
+    """
+    depth    = 0
+    in_class = False
+    idx      = 0
+    while idx < len(regexp_str):
+        char = regexp_str[idx]
+        if char == "\\":
+            idx += 2
+            continue
+
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+            # a ']' right after the opening '[' (or '[^') is a literal
+            if regexp_str[idx + 1 : idx + 2] == "^":
+                idx += 1
+            if regexp_str[idx + 1 : idx + 2] == "]":
+                idx += 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+        idx += 1
+    return False
+
+
+@utils.memo
+def _required_prefix(regexp_str: str) -> str:
+    r"""Parse the literal text a regular expression must begin with.
+
+    >>> _required_prefix(r'__version__ = "(?P<year_y>[1-9][0-9]{3})"')
+    '__version__ = "'
+    >>> _required_prefix(r'Copyright \(c\) (?P<year_y>[1-9][0-9]{3})')
+    'Copyright (c) '
+    >>> _required_prefix(r'versions?: (?P<year_y>[1-9][0-9]{3})')
+    'version'
+    >>> _required_prefix(r'version\d')
+    'version'
+    >>> _required_prefix(r'ab(c)|d')
+    ''
+    """
+    if _has_toplevel_alternation(regexp_str):
+        return ""
+
+    prefix: typ.List[str] = []
+    idx = 0
+    while idx < len(regexp_str):
+        char = regexp_str[idx]
+        if char == "\\":
+            # escaped punctuation is a literal, \d, \s, \1 etc. are not
+            next_char = regexp_str[idx + 1 : idx + 2]
+            if not next_char or next_char.isalnum():
+                break
+            prefix.append(next_char)
+            idx += 2
+        elif char in _RE_QUANTIFIERS:
+            # the previous char may be optional
+            if prefix:
+                prefix.pop()
+            break
+        elif char in _RE_SPECIAL_CHARS:
+            break
+        else:
+            prefix.append(char)
+            idx += 1
+
+    return "".join(prefix)
+
+
+def _iter_for_pattern(numbered_lines: NumberedLines, pattern: Pattern) -> PatternMatches:
+    if pattern.regexp.flags == _DEFAULT_FLAGS:
+        required_prefix = _required_prefix(pattern.regexp.pattern)
+    else:
+        required_prefix = ""
+
+    for lineno, line in numbered_lines:
+        if required_prefix and required_prefix not in line:
+            # cheap reject before running the regex engine
+            continue
         match = pattern.regexp.search(line)
         if match and len(match.group(0)) > 0:
             yield PatternMatch(lineno, line, pattern, match.span(), match.group(0))
 
 
-def iter_matches(lines: typ.List[str], patterns: typ.List[Pattern]) -> PatternMatches:
+@utils.memo
+def _union_regexp(regexp_strs: typ.Tuple[str, ...]) -> typ.Pattern[str]:
+    # Group names are reused between patterns, so they are replaced
+    # with non-capturing groups. The union only tells us if any pattern
+    # can match a line, not which one.
+    alternatives = [_NAMED_GROUP_RE.sub("(?:", regexp_str) for regexp_str in regexp_strs]
+    return re.compile("|".join(f"(?:{alternative})" for alternative in alternatives))
+
+
+def _candidate_lines(lines: typ.Iterable[str], patterns: typ.List[Pattern]) -> NumberedLines:
+    numbered_lines = enumerate(lines)
+    if len(patterns) < 2:
+        # a single pattern consumes the lines only once
+        return numbered_lines
+
+    union_re: typ.Optional[typ.Pattern[str]]
+    if any(p.regexp.flags != _DEFAULT_FLAGS for p in patterns):
+        union_re = None
+    else:
+        try:
+            union_re = _union_regexp(tuple(p.regexp.pattern for p in patterns))
+        except re.error:
+            union_re = None
+
+    if union_re is None:
+        return list(numbered_lines)
+
+    # Most lines don't contain a version string, so each pattern
+    # only has to search (and we only have to keep) the lines that
+    # any of them can match.
+    return [(lineno, line) for lineno, line in numbered_lines if union_re.search(line)]
+
+
+def iter_matches(lines: typ.Iterable[str], patterns: typ.List[Pattern]) -> PatternMatches:
     """Iterate over all matches of any pattern on any line.
 
     >>> from . import v1patterns
@@ -76,9 +211,10 @@ def iter_matches(lines: typ.List[str], patterns: typ.List[Pattern]) -> PatternMa
     ...     match  = "v201712.0002-alpha",
     ... )
     """
+    numbered_lines = _candidate_lines(lines, patterns)
     matched_spans: LineSpans = []
     for pattern in patterns:
-        for match in _iter_for_pattern(lines, pattern):
+        for match in _iter_for_pattern(numbered_lines, pattern):
             needle_span = LineSpan(match.lineno, *match.span)
             if not _has_overlap(needle_span, matched_spans):
                 yield match
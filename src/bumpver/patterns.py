@@ -13,7 +13,7 @@ class Pattern(typ.NamedTuple):
     regexp         : typ.Pattern[str]
 
 
-RE_PATTERN_ESCAPES = [
+RE_PATTERN_ESCAPES = (
     ("\u005c", "\u005c\u005c"),
     ("-"     , "\u005c-"),
     ("."     , "\u005c."),
@@ -26,4 +26,4 @@ RE_PATTERN_ESCAPES = [
     ("]"     , "\u005c]"),
     ("("     , "\u005c("),
     (")"     , "\u005c)"),
-]
+)
@@ -7,11 +7,13 @@ import re
 import logging
 import textwrap
 
+from . import utils
 from . import pysix
 
 logger = logging.getLogger("bumpver.regexfmt")
 
 
+@utils.memo
 def format_regex(regex: str) -> str:
     r"""Format a regex pattern suitible for flags=re.VERBOSE.
 
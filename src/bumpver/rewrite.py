@@ -3,14 +3,21 @@
 #
 # Copyright (c) 2018-2024 Manuel Barkhau (mbarkhau@gmail.com) - MIT License
 # SPDX-License-Identifier: MIT
+import os
 import typing as typ
+import shutil
 import difflib
+import logging
+import tempfile
 
 from bumpver import pathlib as pl
 
+from . import parse
 from . import config
 from .patterns import Pattern
 
+logger = logging.getLogger("bumpver.rewrite")
+
 
 class NoPatternMatch(Exception):
     """Pattern not found in content.
@@ -35,13 +42,18 @@ def detect_line_sep(content: str) -> str:
     '\n'
     >>> detect_line_sep('')
     '\n'
+    >>> detect_line_sep('a\rb\r\n')
+    '\r\n'
     """
-    if "\r\n" in content:
+    # A single scan for files without "\r", any "\r\n" can only
+    # be found after the first "\r".
+    cr_idx = content.find("\r")
+    if cr_idx < 0:
+        return "\n"
+    elif content.find("\r\n", cr_idx) >= 0:
         return "\r\n"
-    elif "\r" in content:
-        return "\r"
     else:
-        return "\n"
+        return "\r"
 
 
 class RewrittenFileData(typ.NamedTuple):
@@ -55,6 +67,30 @@ class RewrittenFileData(typ.NamedTuple):
 
 PathPatternsItem = typ.Tuple[pl.Path, typ.List[Pattern]]
 
+Replacement          = typ.Tuple[parse.Start, parse.End, str]
+ReplacementsByLineNo = typ.Dict[parse.LineNo, typ.List[Replacement]]
+
+
+def apply_replacements(
+    old_lines   : typ.List[str],
+    replacements: ReplacementsByLineNo,
+) -> typ.List[str]:
+    """Splice replacements into the lines they belong to.
+
+    Spans are relative to the original line and must not overlap, so
+    they are applied right to left, which keeps earlier spans valid.
+
+    >>> apply_replacements(["a", "(1) (2)"], {1: [(1, 2, "3"), (5, 6, "4")]})
+    ['a', '(3) (4)']
+    """
+    new_lines = old_lines[:]
+    for lineno, line_replacements in replacements.items():
+        new_line = old_lines[lineno]
+        for span_l, span_r, replacement in sorted(line_replacements, reverse=True):
+            new_line = new_line[:span_l] + replacement + new_line[span_r:]
+        new_lines[lineno] = new_line
+    return new_lines
+
 
 def iter_path_patterns_items(
     file_patterns: config.PatternsByFile,
@@ -68,6 +104,127 @@ def iter_path_patterns_items(
             raise IOError(errmsg)
 
 
+# NOTE: python2 has no os.replace, os.rename is atomic on posix.
+_replace = getattr(os, 'replace', os.rename)
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    # Encoded once and handed to the fd directly, without a buffered
+    # file object. A regular file is written in one call, the loop
+    # only handles short writes.
+    try:
+        while data:
+            written = os.write(fd, data)
+            data    = data[written:]
+    finally:
+        os.close(fd)
+
+
+def _copy_owner(stat: os.stat_result, path: str) -> None:
+    try:
+        os.chown(path, stat.st_uid, stat.st_gid)
+    except (AttributeError, OSError):
+        pass  # no os.chown on windows, or not permitted for this user
+
+
+def _write_via_tmp(real_path: str, stat: os.stat_result, data: bytes) -> None:
+    dirname, basename = os.path.split(real_path)
+    tmp_fd, tmp_path  = tempfile.mkstemp(prefix=f".{basename}.", suffix=".tmp", dir=dirname)
+    try:
+        _write_all(tmp_fd, data)
+        shutil.copymode(real_path, tmp_path)
+        _copy_owner(stat, tmp_path)
+        _replace(tmp_path, real_path)
+    finally:
+        # only still exists if the rename didn't happen
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def write_content(path: str, content: str) -> None:
+    """Write content to path via a temporary file in the same directory.
+
+    The file is replaced with a rename, so it is never left partially
+    written. Symlinks are followed, the file mode and (if permitted) the
+    owner are preserved. Extended attributes are not preserved by the
+    rename.
+
+    Files with multiple hardlinks are written in place, so the links are
+    not broken. The same in-place write is the fallback if the rename is
+    not possible (single file bind mounts, a directory that isn't
+    writable or a file locked by another process on windows).
+    """
+    real_path = os.path.realpath(path)
+    data      = content.encode("utf-8")
+    stat      = os.stat(real_path)
+
+    if stat.st_nlink == 1:
+        try:
+            _write_via_tmp(real_path, stat, data)
+            return
+        except OSError as ex:
+            logger.debug(f"Could not replace '{path}' ({ex}), writing in place.")
+
+    _write_all(os.open(real_path, os.O_WRONLY | os.O_TRUNC), data)
+
+
+def _format_range(start: int, stop: int) -> str:
+    # same as difflib._format_range_unified
+    beginning = start + 1
+    length    = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if length == 0:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def _positional_diff_lines(rfd: RewrittenFileData, context: int = 3) -> typ.Iterable[str]:
+    # Rewritten files have the same number of lines as the original,
+    # only lines at the same position are changed. This means hunks
+    # can be built directly from the indexes of the changed lines,
+    # without the (quadratic worst case) SequenceMatcher of difflib.
+    old_lines = rfd.old_lines
+    new_lines = rfd.new_lines
+
+    changed = [idx for idx, (old, new) in enumerate(zip(old_lines, new_lines)) if old != new]
+    if not changed:
+        return
+
+    yield f"--- {rfd.path}"
+    yield f"+++ {rfd.path}"
+
+    hunks: typ.List[typ.List[int]] = [[changed[0]]]
+    for idx in changed[1:]:
+        # like difflib, unchanged runs longer than 2 * context split hunks
+        if idx - hunks[-1][-1] - 1 > 2 * context:
+            hunks.append([idx])
+        else:
+            hunks[-1].append(idx)
+
+    for hunk in hunks:
+        start = max(0, hunk[0] - context)
+        stop  = min(len(old_lines), hunk[-1] + context + 1)
+        rng   = _format_range(start, stop)
+        yield f"@@ -{rng} +{rng} @@"
+
+        idx = start
+        while idx < stop:
+            if old_lines[idx] == new_lines[idx]:
+                yield " " + old_lines[idx]
+                idx += 1
+                continue
+
+            run_end = idx
+            while run_end < stop and old_lines[run_end] != new_lines[run_end]:
+                run_end += 1
+            for line in old_lines[idx:run_end]:
+                yield "-" + line
+            for line in new_lines[idx:run_end]:
+                yield "+" + line
+            idx = run_end
+
+
 def diff_lines(rfd: RewrittenFileData) -> typ.List[str]:
     r"""Generate unified diff.
 
@@ -79,7 +236,16 @@ def diff_lines(rfd: RewrittenFileData) -> typ.List[str]:
     ... )
     >>> diff_lines(rfd)
     ['--- <path>', '+++ <path>', '@@ -1 +1 @@', '-foo', '+bar']
+    >>> diff_lines(rfd._replace(new_lines=["foo"]))
+    []
     """
+    if rfd.old_lines == rfd.new_lines:
+        # nothing to diff, don't bother the SequenceMatcher
+        return []
+
+    if len(rfd.old_lines) == len(rfd.new_lines):
+        return list(_positional_diff_lines(rfd))
+
     lines = difflib.unified_diff(
         a=rfd.old_lines,
         b=rfd.new_lines,
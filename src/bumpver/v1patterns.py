@@ -46,12 +46,12 @@ PYCALVER_PATTERN = r"""
 (?P<pycalver>
     (?P<vYYYYMM>
        v                        # "v" version prefix
-       (?P<year>\d{4})
-       (?P<month>\d{2})
+       (?P<year>[0-9]{4})
+       (?P<month>[0-9]{2})
     )
     (?P<build>
         \.                      # "." build nr prefix
-        (?P<build_no>\d{4,})
+        (?P<build_no>[0-9]{4,})
     )
     (?P<release>
         \-                      # "-" release prefix
@@ -77,40 +77,40 @@ COMPOSITE_PART_PATTERNS = {
 
 
 PART_PATTERNS = {
-    'year'       : r"\d{4}",
+    'year'       : r"[0-9]{4}",
     'month'      : r"(?:0[0-9]|1[0-2])",
     'month_short': r"(?:1[0-2]|[1-9])",
-    'build_no'   : r"\d{4,}",
-    'pep440_tag' : r"(?:a|b|dev|rc|post)?\d*",
+    'build_no'   : r"[0-9]{4,}",
+    'pep440_tag' : r"(?:a|b|dev|rc|post)?[0-9]*",
     'tag'        : r"(?:alpha|beta|dev|rc|post|final)",
-    'yy'         : r"\d{2}",
-    'yyyy'       : r"\d{4}",
+    'yy'         : r"[0-9]{2}",
+    'yyyy'       : r"[0-9]{4}",
     'quarter'    : r"[1-4]",
-    'iso_week'   : r"(?:[0-4]\d|5[0-3])",
-    'us_week'    : r"(?:[0-4]\d|5[0-3])",
+    'iso_week'   : r"(?:[0-4][0-9]|5[0-3])",
+    'us_week'    : r"(?:[0-4][0-9]|5[0-3])",
     'dom'        : r"(0[1-9]|[1-2][0-9]|3[0-1])",
     'dom_short'  : r"([1-9]|[1-2][0-9]|3[0-1])",
-    'doy'        : r"(?:[0-2]\d\d|3[0-5][0-9]|36[0-6])",
-    'doy_short'  : r"(?:[0-2]\d\d|3[0-5][0-9]|36[0-6])",
-    'MAJOR'      : r"\d+",
-    'MINOR'      : r"\d+",
-    'MM'         : r"\d{2,}",
-    'MMM'        : r"\d{3,}",
-    'MMMM'       : r"\d{4,}",
-    'MMMMM'      : r"\d{5,}",
-    'PATCH'      : r"\d+",
-    'PP'         : r"\d{2,}",
-    'PPP'        : r"\d{3,}",
-    'PPPP'       : r"\d{4,}",
-    'PPPPP'      : r"\d{5,}",
-    'bid'        : r"\d{4,}",
-    'BID'        : r"[1-9]\d*",
-    'BB'         : r"[1-9]\d{1,}",
-    'BBB'        : r"[1-9]\d{2,}",
-    'BBBB'       : r"[1-9]\d{3,}",
-    'BBBBB'      : r"[1-9]\d{4,}",
-    'BBBBBB'     : r"[1-9]\d{5,}",
-    'BBBBBBB'    : r"[1-9]\d{6,}",
+    'doy'        : r"(?:[0-2][0-9][0-9]|3[0-5][0-9]|36[0-6])",
+    'doy_short'  : r"(?:[0-2][0-9][0-9]|3[0-5][0-9]|36[0-6])",
+    'MAJOR'      : r"[0-9]+",
+    'MINOR'      : r"[0-9]+",
+    'MM'         : r"[0-9]{2,}",
+    'MMM'        : r"[0-9]{3,}",
+    'MMMM'       : r"[0-9]{4,}",
+    'MMMMM'      : r"[0-9]{5,}",
+    'PATCH'      : r"[0-9]+",
+    'PP'         : r"[0-9]{2,}",
+    'PPP'        : r"[0-9]{3,}",
+    'PPPP'       : r"[0-9]{4,}",
+    'PPPPP'      : r"[0-9]{5,}",
+    'bid'        : r"[0-9]{4,}",
+    'BID'        : r"[1-9][0-9]*",
+    'BB'         : r"[1-9][0-9]{1,}",
+    'BBB'        : r"[1-9][0-9]{2,}",
+    'BBBB'       : r"[1-9][0-9]{3,}",
+    'BBBBB'      : r"[1-9][0-9]{4,}",
+    'BBBBBB'     : r"[1-9][0-9]{5,}",
+    'BBBBBBB'    : r"[1-9][0-9]{6,}",
 }
 
 
@@ -198,29 +198,32 @@ def _init_composite_patterns() -> None:
 _init_composite_patterns()
 
 
-def _compile_pattern_re(normalized_pattern: str) -> typ.Pattern[str]:
-    escaped_pattern = normalized_pattern
-    for char, escaped in RE_PATTERN_ESCAPES:
-        escaped_pattern = escaped_pattern.replace(char, escaped)
+# Every escape only prefixes a single char, so all of them can be
+# applied in a single pass.
+_RE_PATTERN_ESCAPE_TABLE = {ord(char): escaped for char, escaped in RE_PATTERN_ESCAPES}
+
 
-    pattern_str = _replace_pattern_parts(escaped_pattern)
+def _compile_pattern_re(normalized_pattern: str) -> typ.Pattern[str]:
+    escaped_pattern = normalized_pattern.translate(_RE_PATTERN_ESCAPE_TABLE)
+    pattern_str     = _replace_pattern_parts(escaped_pattern)
     return re.compile(pattern_str)
 
 
+_PEP440_PATTERN_BY_VERSION_PATTERN = {
+    r"{pycalver}"                    : r"{pep440_pycalver}",
+    r"{semver}"                      : r"{semver}",
+    r"v{year}{month}{build}{release}": r"{year}{month}.{BID}{pep440_tag}",
+    r"{year}{month}{build}{release}" : r"{year}{month}.{BID}{pep440_tag}",
+    r"v{year}{build}{release}"       : r"{year}.{BID}{pep440_tag}",
+    r"{year}{build}{release}"        : r"{year}.{BID}{pep440_tag}",
+}
+
+
 def _normalized_pattern(version_pattern: str, raw_pattern: str) -> str:
     res = raw_pattern.replace(r"{version}", version_pattern)
-    if version_pattern == r"{pycalver}":
-        res = res.replace(r"{pep440_version}", r"{pep440_pycalver}")
-    elif version_pattern == r"{semver}":
-        res = res.replace(r"{pep440_version}", r"{semver}")
-    elif version_pattern == r"v{year}{month}{build}{release}":
-        res = res.replace(r"{pep440_version}", r"{year}{month}.{BID}{pep440_tag}")
-    elif version_pattern == r"{year}{month}{build}{release}":
-        res = res.replace(r"{pep440_version}", r"{year}{month}.{BID}{pep440_tag}")
-    elif version_pattern == r"v{year}{build}{release}":
-        res = res.replace(r"{pep440_version}", r"{year}.{BID}{pep440_tag}")
-    elif version_pattern == r"{year}{build}{release}":
-        res = res.replace(r"{pep440_version}", r"{year}.{BID}{pep440_tag}")
+    pep440_pattern = _PEP440_PATTERN_BY_VERSION_PATTERN.get(version_pattern)
+    if pep440_pattern is not None:
+        res = res.replace(r"{pep440_version}", pep440_pattern)
     elif r"{pep440_version}" in raw_pattern:
         logger.warning(f"No mapping of '{version_pattern}' to '{{pep440_version}}'")
 
@@ -314,12 +314,16 @@ def _iter_part_patterns(pattern: str) -> typ.Iterator[typ.Tuple[SortKey, Postiti
             yield (sort_key, positioned_part)
 
 
+_OPTIONAL_START_RE = re.compile(r"([^\\]|^)\[")
+_OPTIONAL_END_RE   = re.compile(r"([^\\]|^)\]")
+
+
 def _replace_pattern_parts(pattern: str) -> str:
     # The pattern is escaped, so that everything besides the format
     # string variables is treated literally.
     while True:
-        new_pattern, _n = re.subn(r"([^\\]|^)\[", r"\1(?:", pattern)
-        new_pattern, _m = re.subn(r"([^\\]|^)\]", r"\1)?" , new_pattern)
+        new_pattern, _n = _OPTIONAL_START_RE.subn(r"\1(?:", pattern)
+        new_pattern, _m = _OPTIONAL_END_RE.subn(r"\1)?" , new_pattern)
         pattern = new_pattern
         if _n + _m == 0:
             break
@@ -339,17 +343,18 @@ def _replace_pattern_parts(pattern: str) -> str:
     return result_pattern
 
 
+# [] braces are used for optional parts, such as [-TAG]/[-beta]
+# and need to be escaped manually. All other chars are escaped so
+# they are literals in the re pattern.
+_RE_PATTERN_ESCAPE_TABLE = {
+    ord(char): escaped for char, escaped in RE_PATTERN_ESCAPES if char not in "[]\\"
+}
+
+
+@utils.memo
 def _compile_pattern_re(normalized_pattern: str) -> typ.Pattern[str]:
-    escaped_pattern = normalized_pattern
-    for char, escaped in RE_PATTERN_ESCAPES:
-        # [] braces are used for optional parts, such as [-TAG]/[-beta]
-        # and need to be escaped manually.
-        is_semantic_char = char in "[]\\"
-        if not is_semantic_char:
-            # escape it so it is a literal in the re pattern
-            escaped_pattern = escaped_pattern.replace(char, escaped)
-
-    pattern_str = _replace_pattern_parts(escaped_pattern)
+    escaped_pattern = normalized_pattern.translate(_RE_PATTERN_ESCAPE_TABLE)
+    pattern_str     = _replace_pattern_parts(escaped_pattern)
     return re.compile(pattern_str)
 
 
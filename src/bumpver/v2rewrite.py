@@ -5,10 +5,11 @@
 # SPDX-License-Identifier: MIT
 """Rewrite files, updating occurences of version strings."""
 
-import io
 import typing as typ
 import logging
 
+from bumpver import pathlib as pl
+
 from . import parse
 from . import config
 from . import rewrite
@@ -27,21 +28,25 @@ def rewrite_lines(
     old_lines: typ.List[str],
 ) -> typ.List[str]:
     """Replace occurances of patterns in old_lines with new_vinfo."""
-    found_patterns: typ.Set[Pattern] = set()
+    # the replacement only depends on the pattern, not on the match
+    replacement_by_pattern: typ.Dict[Pattern, str] = {}
 
-    new_lines = old_lines[:]
+    replacements: rewrite.ReplacementsByLineNo = {}
     for match in parse.iter_matches(old_lines, patterns):
-        found_patterns.add(match.pattern)
-        normalized_pattern = v2patterns.normalize_pattern(
-            match.pattern.version_pattern, match.pattern.raw_pattern
-        )
-        replacement = v2version.format_version(new_vinfo, normalized_pattern)
+        replacement = replacement_by_pattern.get(match.pattern)
+        if replacement is None:
+            normalized_pattern = v2patterns.normalize_pattern(
+                match.pattern.version_pattern, match.pattern.raw_pattern
+            )
+            replacement = v2version.format_version(new_vinfo, normalized_pattern)
+            replacement_by_pattern[match.pattern] = replacement
         span_l, span_r = match.span
-        new_line = match.line[:span_l] + replacement + match.line[span_r:]
-        new_lines[match.lineno] = new_line
+        replacements.setdefault(match.lineno, []).append((span_l, span_r, replacement))
+
+    found_patterns = set(replacement_by_pattern)
 
     if set(patterns) == found_patterns:
-        return new_lines
+        return rewrite.apply_replacements(old_lines, replacements)
 
     non_matched_patterns = set(patterns) - found_patterns
     if len(found_patterns) > 0:
@@ -115,53 +120,66 @@ def iter_rewritten(
         with file_path.open(mode="rt", newline='', encoding="utf-8") as fobj:
             content = fobj.read()
 
-        rfd = rfd_from_content(patterns, new_vinfo, content)
+        try:
+            rfd = rfd_from_content(patterns, new_vinfo, content)
+        except rewrite.NoPatternMatch as ex:
+            # pylint:disable=raise-missing-from  ; we support py2, so not an option
+            errmsg = f"No patterns matched for file '{file_path}'. " + " ".join(ex.args)
+            raise rewrite.NoPatternMatch(errmsg)
+
         yield rfd._replace(path=str(file_path))
 
 
+def rewritten_files(
+    file_patterns: config.PatternsByFile,
+    new_vinfo    : version.V2VersionInfo,
+) -> typ.List[rewrite.RewrittenFileData]:
+    """Rewrite the content of all files (in memory), sorted by path."""
+    return sorted(iter_rewritten(file_patterns, new_vinfo), key=lambda rfd: rfd.path)
+
+
 def diff(
     old_vinfo    : version.V2VersionInfo,
     new_vinfo    : version.V2VersionInfo,
     file_patterns: config.PatternsByFile,
+    rfds         : typ.Optional[typ.List[rewrite.RewrittenFileData]] = None,
 ) -> str:
     r"""Generate diffs of rewritten files."""
 
-    full_diff = ""
-    fobj: typ.IO[str]
+    if rfds is None:
+        rfds = rewritten_files(file_patterns, new_vinfo)
 
-    for file_path, patterns in sorted(rewrite.iter_path_patterns_items(file_patterns)):
-        with file_path.open(mode="rt", newline='', encoding="utf-8") as fobj:
-            content = fobj.read()
+    patterns_by_path = {str(pl.Path(path)): patterns for path, patterns in file_patterns.items()}
 
-        try:
-            rfd = rfd_from_content(patterns, new_vinfo, content)
-        except rewrite.NoPatternMatch as ex:
-            # pylint:disable=raise-missing-from  ; we support py2, so not an option
-            errmsg = f"No patterns matched for file '{file_path}'. " + " ".join(ex.args)
-            raise rewrite.NoPatternMatch(errmsg)
-
-        rfd   = rfd._replace(path=str(file_path))
+    diff_chunks: typ.List[str] = []
+    for rfd in rfds:
         lines = rewrite.diff_lines(rfd)
 
-        patterns_with_change = _patterns_with_change(old_vinfo, new_vinfo, patterns)
+        patterns_with_change = _patterns_with_change(old_vinfo, new_vinfo, patterns_by_path[rfd.path])
         if len(lines) == 0 and patterns_with_change > 0:
-            errmsg = f"No patterns matched for file '{file_path}'"
+            errmsg = f"No patterns matched for file '{rfd.path}'"
             raise rewrite.NoPatternMatch(errmsg)
 
-        full_diff += "\n".join(lines) + "\n"
+        diff_chunks.append("\n".join(lines) + "\n")
 
-    full_diff = full_diff.rstrip("\n")
+    full_diff = "".join(diff_chunks).rstrip("\n")
     return full_diff
 
 
 def rewrite_files(
     file_patterns: config.PatternsByFile,
     new_vinfo    : version.V2VersionInfo,
+    rfds         : typ.Optional[typ.List[rewrite.RewrittenFileData]] = None,
 ) -> None:
-    """Rewrite project files, updating each with the new version."""
-    fobj: typ.IO[str]
+    """Rewrite project files, updating each with the new version.
 
-    for file_data in iter_rewritten(file_patterns, new_vinfo):
+    If rfds were already generated (e.g. for a diff), they are written
+    as is, rather than reading and rewriting the files a second time.
+    """
+    rewritten = iter_rewritten(file_patterns, new_vinfo) if rfds is None else rfds
+    for file_data in rewritten:
+        if file_data.new_lines == file_data.old_lines:
+            # e.g. a version pattern without a changed part, don't touch the file
+            continue
         new_content = file_data.line_sep.join(file_data.new_lines)
-        with io.open(file_data.path, mode="wt", newline='', encoding="utf-8") as fobj:
-            fobj.write(new_content)
+        rewrite.write_content(file_data.path, new_content)
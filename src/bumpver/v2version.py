@@ -317,6 +317,12 @@ def is_valid(version_str: str, raw_pattern: str = "vYYYY.BUILD[-TAG]") -> bool:
     >>> is_valid("v201712.0033-beta", raw_pattern="MAJOR.MINOR.PATCH")
     False
     """
+    # Fast rejection, without building the error message of a PatternError.
+    # The compiled pattern is cached, so this doesn't recompile per call.
+    pattern = v2patterns.compile_pattern(raw_pattern)
+    if pattern.regexp.match(version_str) is None:
+        return False
+
     try:
         parse_version_info(version_str, raw_pattern)
         return True
@@ -18,6 +18,7 @@ mercurial, then the git terms are used. For example "fetch"
 import os
 import re
 import sys
+import time
 import shlex
 import typing as typ
 import logging
@@ -49,8 +50,8 @@ VCS_SUBCOMMANDS_BY_NAME = {
         'fetch'         : "git fetch",
         'ls_tags'       : "git tag --list",
         'ls_tags_branch': "git tag --list --merged",
-        'status'        : "git status --porcelain",
-        'add_path'      : "git add --update '{path}'",
+        'status'        : "git status --porcelain -z",
+        'add_paths'     : "git add --update -- {paths}",
         'commit'        : "git commit --message '{message}'",
         'tag'           : "git tag --annotate {tag} --message '{message}'",
         'tag_light'     : "git tag {tag}",
@@ -64,8 +65,8 @@ VCS_SUBCOMMANDS_BY_NAME = {
         'fetch'         : "hg pull",
         'ls_tags'       : "hg tags",
         'ls_tags_branch': "hg log --branch . --rev='tag()' --template='{{tags}}\\n'",
-        'status'        : "hg status -umard",
-        'add_path'      : "hg add '{path}'",
+        'status'        : "hg status -umard --print0",
+        'add_paths'     : "hg add {paths}",
         'commit'        : "hg commit --logfile '{path}'",
         'tag'           : "hg tag {tag} --message '{message}'",
         'tag_light'     : "hg tag {tag}",
@@ -78,6 +79,46 @@ VCS_SUBCOMMANDS_BY_NAME = {
 
 Env = typ.Dict[str, str]
 
+# Consecutive invocations (e.g. 'bumpver show' while editing a changelog)
+# don't fetch again, if the last fetch is more recent than this.
+FETCH_MAX_AGE = 60  # seconds
+
+FETCH_TIMESTAMP_FILENAME = "bumpver_last_fetch"
+
+# Upper bound of paths per add invocation, to stay well below the
+# command line length limit of any platform.
+MAX_ADD_PATHS = 100
+
+StatusItem = typ.Tuple[str, str]
+
+
+def _iter_git_status_items(status_output: str) -> typ.Iterable[StatusItem]:
+    r"""Parse output of 'git status --porcelain -z'.
+
+    >>> list(_iter_git_status_items(" M a b.py\0R  new.py\0old.py\0?? c.py\0"))
+    [('M', 'a b.py'), ('R', 'new.py'), ('??', 'c.py')]
+    """
+    entries = iter(status_output.split("\0"))
+    for entry in entries:
+        if not entry:
+            continue
+        status = entry[:2].strip()
+        yield (status, entry[3:])
+        if status[:1] in "RC":
+            # renames and copies are followed by the original path
+            next(entries, None)
+
+
+def _iter_hg_status_items(status_output: str) -> typ.Iterable[StatusItem]:
+    r"""Parse output of 'hg status --print0'.
+
+    >>> list(_iter_hg_status_items("M a b.py\0? c.py\0"))
+    [('M', 'a b.py'), ('?', 'c.py')]
+    """
+    for entry in status_output.split("\0"):
+        if entry:
+            yield (entry[:1], entry[2:])
+
 
 class VCSAPI:
     """Absraction for git and mercurial."""
@@ -139,20 +180,51 @@ class VCSAPI:
         except Exception:
             return None
 
+    @property
+    def _fetch_timestamp_path(self) -> str:
+        return os.path.join(f".{self.name}", FETCH_TIMESTAMP_FILENAME)
+
+    def _is_recently_fetched(self) -> bool:
+        try:
+            last_fetch = os.stat(self._fetch_timestamp_path).st_mtime
+        except OSError:
+            return False
+        return time.time() - last_fetch < FETCH_MAX_AGE
+
+    def _touch_fetch_timestamp(self) -> None:
+        if not os.path.isdir(f".{self.name}"):
+            return  # e.g. .git file of a worktree
+
+        with open(self._fetch_timestamp_path, mode="w"):
+            pass
+
+    def clear_fetch_timestamp(self) -> None:
+        """Forget the last fetch, so that the next fetch is not skipped."""
+        if os.path.exists(self._fetch_timestamp_path):
+            os.unlink(self._fetch_timestamp_path)
+
     def fetch(self) -> None:
         """Fetch updates from remote origin."""
+        if self._is_recently_fetched():
+            logger.debug(f"skipping fetch, last fetch was less than {FETCH_MAX_AGE} seconds ago")
+            return
+
         if self.get_remote():
             self('fetch')
+            self._touch_fetch_timestamp()
 
     def status(self, required_files: typ.Set[str]) -> typ.List[str]:
         """Get status lines."""
         status_output = self('status')
-        status_items  = [line.split(" ", 1) for line in status_output.splitlines()]
+        if self.name == 'git':
+            status_items = _iter_git_status_items(status_output)
+        else:
+            status_items = _iter_hg_status_items(status_output)
 
         return [
-            filepath.strip()
+            filepath
             for status, filepath in status_items
-            if filepath.strip() in required_files or status != "??"
+            if filepath in required_files or status != "??"
         ]
 
     def ls_tags(self) -> typ.List[str]:
@@ -169,14 +241,21 @@ class VCSAPI:
 
     def add(self, path: str) -> None:
         """Add updates to be included in next commit."""
-        try:
-            self('add_path', path=path)
-        except sp.CalledProcessError as ex:
-            if "already tracked!" in str(ex):
-                # mercurial
-                return
-            else:
-                raise
+        self.add_many([path])
+
+    def add_many(self, paths: typ.Iterable[str]) -> None:
+        """Add updates of multiple files with as few invocations as possible."""
+        sorted_paths = sorted(paths)
+        for offset in range(0, len(sorted_paths), MAX_ADD_PATHS):
+            chunk = sorted_paths[offset : offset + MAX_ADD_PATHS]
+            try:
+                self('add_paths', paths=" ".join(f"'{path}'" for path in chunk))
+            except sp.CalledProcessError as ex:
+                if "already tracked!" in str(ex):
+                    # mercurial
+                    continue
+                else:
+                    raise
 
     def commit(self, message: str) -> None:
         """Commit added files."""
@@ -249,15 +328,17 @@ def get_vcs_api() -> VCSAPI:
 def assert_not_dirty(vcs_api: VCSAPI, filepaths: typ.Set[str], allow_dirty: bool) -> None:
     dirty_files = vcs_api.status(required_files=filepaths)
 
-    if dirty_files:
-        logger.warning(f"{vcs_api.name} working directory is not clean. Uncomitted file(s):")
-        for dirty_file in dirty_files:
-            logger.warning("    " + dirty_file)
+    if not dirty_files:
+        return
+
+    logger.warning(f"{vcs_api.name} working directory is not clean. Uncomitted file(s):")
+    for dirty_file in dirty_files:
+        logger.warning("    " + dirty_file)
 
-    if not allow_dirty and dirty_files:
+    if not allow_dirty:
         sys.exit(1)
 
-    dirty_pattern_files = set(dirty_files) & filepaths
+    dirty_pattern_files = filepaths.intersection(dirty_files)
     if dirty_pattern_files:
         logger.error("Not commiting when pattern files are dirty:")
         for dirty_file in dirty_pattern_files:
@@ -278,8 +359,7 @@ def commit(
             logger.info(f"Run pre-commit hook: {cfg.pre_commit_hook}")
             hooks.run(cfg.pre_commit_hook, cfg.current_version, new_version)
 
-        for filepath in filepaths:
-            vcs_api.add(filepath)
+        vcs_api.add_many(filepaths)
 
         vcs_api.commit(commit_message)
 
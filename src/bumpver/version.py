@@ -12,6 +12,7 @@ from . import setuptools_v65_version
 MaybeInt = typ.Optional[int]
 
 
+@utils.memo
 def parse_version(version: str) -> typ.Any:
     return setuptools_v65_version.parse(version)
 
@@ -172,6 +173,7 @@ def quarter_from_month(month: int) -> int:
     return ((month - 1) // 3) + 1
 
 
+@utils.memo
 def to_pep440(version: str) -> str:
     """Derive pep440 compliant version string from PyCalVer version string.
 
@@ -19,6 +19,7 @@ import pytest
 from click.testing import CliRunner
 
 from bumpver import cli
+from bumpver import vcs
 from bumpver import utils
 from bumpver import config
 from bumpver import pathlib as pl
@@ -658,6 +659,152 @@ def test_empty_git_bump(runner, caplog):
     assert any(("setup.cfg" in r.message) for r in caplog.records)
 
 
+def test_git_bump_dirty_pattern_file(runner, caplog):
+    _add_project_files("README.md")
+    _vcs_init("git")
+
+    result = runner.invoke(cli.cli, ['init', "-vv"])
+    assert result.exit_code == 0
+
+    _update_config_val(
+        "bumpver.toml",
+        version_pattern='"vYYYY.BUILD[-TAG]"',
+        current_version='"' + _today.strftime("v%Y.1001-alpha") + '"',
+    )
+
+    shell("git", "add", "bumpver.toml")
+    shell("git", "commit", "-m", "initial commit")
+
+    # unstaged modification, reported as " M README.md"
+    with pl.Path("README.md").open(mode="at", encoding="utf-8") as fobj:
+        fobj.write("\nmodified\n")
+
+    result = runner.invoke(cli.cli, ['update', "--allow-dirty"])
+    assert result.exit_code == 1
+
+    assert any(("Not commiting when pattern files are dirty" in r.message) for r in caplog.records)
+    assert any((r.message.strip() == "README.md") for r in caplog.records)
+
+
+def test_git_add_many(runner, monkeypatch):
+    filenames = [f"file {i}.txt" for i in range(5)]
+    for filename in filenames:
+        with pl.Path(filename).open(mode="wt", encoding="utf-8") as fobj:
+            fobj.write("initial\n")
+    _vcs_init("git", files=filenames)
+
+    for filename in filenames:
+        with pl.Path(filename).open(mode="at", encoding="utf-8") as fobj:
+            fobj.write("modified\n")
+
+    vcs_api   = vcs.VCSAPI('git')
+    calls     = []
+    orig_call = vcs.VCSAPI.__call__
+
+    def _call(self, cmd_name, env=None, **kwargs):
+        calls.append(cmd_name)
+        return orig_call(self, cmd_name, env=env, **kwargs)
+
+    monkeypatch.setattr(vcs, 'MAX_ADD_PATHS', 2)
+    monkeypatch.setattr(vcs.VCSAPI, '__call__', _call)
+    vcs_api.add_many(filenames)
+
+    assert calls == ['add_paths'] * 3
+    staged = shell("git", "diff", "--cached", "--name-only", "-z").decode("utf-8")
+    assert sorted(staged.strip("\0").split("\0")) == filenames
+
+
+def _fetch_test_init(runner, monkeypatch):
+    _add_project_files("README.md")
+    _vcs_init("git")
+
+    result = runner.invoke(cli.cli, ['init', "-vv"])
+    assert result.exit_code == 0
+
+    _update_config_val(
+        "bumpver.toml",
+        version_pattern='"vYYYY.BUILD[-TAG]"',
+        current_version='"' + _today.strftime("v%Y.1001-alpha") + '"',
+    )
+
+    fetch_calls = []
+    orig_call   = vcs.VCSAPI.__call__
+
+    def _call(self, cmd_name, env=None, **kwargs):
+        if cmd_name == 'fetch':
+            fetch_calls.append(cmd_name)
+            return ""
+        return orig_call(self, cmd_name, env=env, **kwargs)
+
+    monkeypatch.setattr(vcs.VCSAPI, 'get_remote', lambda self: "origin")
+    monkeypatch.setattr(vcs.VCSAPI, '__call__', _call)
+    return fetch_calls
+
+
+def test_git_is_recently_fetched(runner):
+    _add_project_files("README.md")
+    _vcs_init("git")
+
+    vcs_api = vcs.VCSAPI('git')
+    assert not vcs_api._is_recently_fetched()
+
+    timestamp_path = pl.Path(".git") / vcs.FETCH_TIMESTAMP_FILENAME
+    timestamp_path.touch()
+    assert vcs_api._is_recently_fetched()
+
+    old_mtime = time.time() - vcs.FETCH_MAX_AGE - 1
+    os.utime(str(timestamp_path), (old_mtime, old_mtime))
+    assert not vcs_api._is_recently_fetched()
+
+
+@pytest.mark.parametrize("cmd", [['show'], ['update', "--dry"]])
+def test_git_fetch_skipped(runner, monkeypatch, cmd):
+    fetch_calls = _fetch_test_init(runner, monkeypatch)
+
+    timestamp_path = pl.Path(".git") / vcs.FETCH_TIMESTAMP_FILENAME
+    assert not timestamp_path.exists()
+
+    result = runner.invoke(cli.cli, cmd)
+    assert result.exit_code == 0
+    assert fetch_calls == ['fetch']
+    assert timestamp_path.exists()
+
+    # second invocation within FETCH_MAX_AGE
+    result = runner.invoke(cli.cli, cmd)
+    assert result.exit_code == 0
+    assert fetch_calls == ['fetch']
+
+
+@pytest.mark.parametrize("cmd", [['show'], ['update', "--dry"]])
+def test_git_force_fetch(runner, monkeypatch, cmd):
+    fetch_calls = _fetch_test_init(runner, monkeypatch)
+
+    timestamp_path = pl.Path(".git") / vcs.FETCH_TIMESTAMP_FILENAME
+    timestamp_path.touch()
+
+    result = runner.invoke(cli.cli, cmd + ["--force-fetch"])
+    assert result.exit_code == 0
+    assert fetch_calls == ['fetch']
+
+    # without a remote, the cleared timestamp is not written again
+    monkeypatch.setattr(vcs.VCSAPI, 'get_remote', lambda self: None)
+    timestamp_path.touch()
+
+    result = runner.invoke(cli.cli, cmd + ["--force-fetch"])
+    assert result.exit_code == 0
+    assert fetch_calls == ['fetch']
+    assert not timestamp_path.exists()
+
+
+@pytest.mark.parametrize("cmd", [['show'], ['update', "--dry"]])
+def test_force_fetch_no_fetch(runner, monkeypatch, cmd):
+    fetch_calls = _fetch_test_init(runner, monkeypatch)
+
+    result = runner.invoke(cli.cli, cmd + ["--force-fetch", "--no-fetch"])
+    assert result.exit_code == 1
+    assert fetch_calls == []
+
+
 def test_empty_hg_bump(runner, caplog):
     shell("hg", "init")
     with pl.Path("setup.cfg").open(mode="w", encoding="utf-8") as fobj:
@@ -993,6 +1140,21 @@ def test_get_diff(runner, version_pattern, cur_version, cur_pep440):
     assert f'+current_version = "{cur_version}"' in diff_lines
 
 
+def test_get_diff_same_version(runner):
+    _add_project_files("README.md", "setup.cfg")
+    result = runner.invoke(cli.cli, ['init', "-vv"])
+    assert result.exit_code == 0
+
+    _update_config_val(
+        "setup.cfg",
+        version_pattern='"vYYYY0M.BUILD[-TAG]"',
+        current_version='"v201707.1002-alpha"',
+    )
+    _, cfg = config.init()
+    assert cli.get_diff(cfg, cfg.current_version) == ""
+    assert cli.get_diff(cfg, "v201707.1003-alpha") != ""
+
+
 WEEKNUM_TEST_CASES = [
     # 2020-12-26  Sat
     ("2020-12-26", "YYYY.0W", "2020.51"),
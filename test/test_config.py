@@ -230,6 +230,55 @@ def test_parse_v2_cfg():
     assert raw_patterns_by_path["src/project/*.py"] == ["Copyright (c) 2018-YYYY"]
 
 
+CFG_SYNTAX_FIXTURE = """
+[metadata]
+license_file: LICENSE
+
+[bumpver]
+# comment
+current_version = "v201808.1456-beta"
+version_pattern: "vYYYY0M.BUILD[-TAG]"
+; another comment
+commit = on
+
+[bumpver:file_patterns]
+setup.py =
+    "vYYYY0M.BUILD[-TAG]"
+
+    # comment within a value
+    YYYY0M.BLD[PYTAGNUM]
+README.MD = {version}
+"""
+
+
+def test_parse_cfg_syntax():
+    buf = mk_buf(CFG_SYNTAX_FIXTURE)
+
+    raw_cfg = config._parse_cfg(buf)
+
+    assert raw_cfg['current_version'] == '"v201808.1456-beta"'
+    assert raw_cfg['version_pattern'] == '"vYYYY0M.BUILD[-TAG]"'
+    assert raw_cfg['commit'] is True
+    assert raw_cfg['file_patterns'] == {
+        'setup.py' : ['"vYYYY0M.BUILD[-TAG]"', "YYYY0M.BLD[PYTAGNUM]"],
+        'README.MD': ["{version}"],
+    }
+
+
+@pytest.mark.parametrize(
+    "cfg_text",
+    [
+        "current_version = 1\n[bumpver]",
+        "[bumpver]\ncurrent_version = 1\n[bumpver]",
+        "[bumpver]\ncurrent_version = 1\ncurrent_version = 2",
+        "[bumpver]\ncurrent_version",
+    ],
+)
+def test_parse_cfg_invalid_syntax(cfg_text):
+    with pytest.raises(ValueError):
+        config._parse_cfg(mk_buf(cfg_text))
+
+
 @pytest.mark.parametrize("tag_scope", [e.value for e in list(config.TagScope)])
 def test_parse_tag_scope_cfg(tag_scope):
     buf = mk_buf(f"{MINIMAL_CFG_FIXTURE}\ntag_scope={tag_scope}")
@@ -286,8 +335,9 @@ def test_parse_project_toml():
 
     assert "v2017.0123-alpha" in config_data
 
-    ctx = config.init_project_ctx(project_path)
-    assert ctx == config.ProjectContext(project_path, config_path, config_rel_path, "toml", None)
+    ctx         = config.init_project_ctx(project_path)
+    dir_entries = frozenset(os.listdir(str(project_path)))
+    assert ctx == config.ProjectContext(project_path, config_path, config_rel_path, "toml", None, dir_entries)
 
     cfg = config.parse(ctx)
 
@@ -312,8 +362,9 @@ def test_parse_project_cfg():
 
     assert "v201307.0456-beta" in config_data
 
-    ctx = config.init_project_ctx(project_path)
-    assert ctx == config.ProjectContext(project_path, config_path, config_rel_path, 'cfg', None)
+    ctx         = config.init_project_ctx(project_path)
+    dir_entries = frozenset(os.listdir(str(project_path)))
+    assert ctx == config.ProjectContext(project_path, config_path, config_rel_path, 'cfg', None, dir_entries)
 
     cfg = config.parse(ctx)
 
@@ -338,7 +389,9 @@ def test_parse_toml_file(tmpdir):
     cfg_file_rel_path = "pycalver.toml"
 
     ctx = config.init_project_ctx(project_path)
-    assert ctx == config.ProjectContext(project_path, cfg_file, cfg_file_rel_path, 'toml', None)
+    assert ctx == config.ProjectContext(
+        project_path, cfg_file, cfg_file_rel_path, 'toml', None, frozenset({"pycalver.toml"})
+    )
 
     cfg = config.parse(ctx)
 
@@ -361,9 +414,10 @@ def test_parse_default_pattern():
     config_path     = util.FIXTURES_DIR / "project_c" / "pyproject.toml"
     config_rel_path = "pyproject.toml"
 
-    ctx = config.init_project_ctx(project_path)
+    ctx         = config.init_project_ctx(project_path)
+    dir_entries = frozenset(os.listdir(str(project_path)))
 
-    assert ctx == config.ProjectContext(project_path, config_path, config_rel_path, "toml", None)
+    assert ctx == config.ProjectContext(project_path, config_path, config_rel_path, "toml", None, dir_entries)
 
     cfg = config.parse(ctx)
 
@@ -389,7 +443,9 @@ def test_parse_cfg_file(tmpdir):
     setup_cfg_rel_path = "setup.cfg"
 
     ctx = config.init_project_ctx(project_path)
-    assert ctx == config.ProjectContext(project_path, setup_cfg, setup_cfg_rel_path, 'cfg', None)
+    assert ctx == config.ProjectContext(
+        project_path, setup_cfg, setup_cfg_rel_path, 'cfg', None, frozenset({"setup.cfg"})
+    )
 
     cfg = config.parse(ctx)
 
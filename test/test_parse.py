@@ -52,6 +52,18 @@ def test_explicit_parse_patterns():
     assert matches[1].match == "version='201712.2a0'"
 
 
+def test_parse_patterns_from_iterator():
+    lines       = iter(SETUP_PY_FIXTURE.splitlines())
+    patterns    = ["{pycalver}", "{pep440_pycalver}"]
+    re_patterns = [v1patterns.compile_pattern(p) for p in patterns]
+    matches     = list(parse.iter_matches(lines, re_patterns))
+    assert [m.lineno for m in matches] == [3, 6]
+
+    lines   = iter(SETUP_PY_FIXTURE.splitlines())
+    matches = list(parse.iter_matches(lines, re_patterns[:1]))
+    assert [m.lineno for m in matches] == [3]
+
+
 README_RST_FIXTURE = """
 :alt: PyPI version
 
@@ -4,10 +4,14 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
+import os
 import re
 import copy
+import errno
 from test import util
 
+import pytest
+
 from bumpver import config
 from bumpver import rewrite
 from bumpver import v1rewrite
@@ -71,6 +75,18 @@ def test_v2_rewrite_lines():
     assert lines == ['__version__ = "201811.123b0"']
 
 
+def test_v2_rewrite_lines_multiple_matches_per_line():
+    version_pattern = "vYYYY0M.BUILD[-TAG]"
+    new_vinfo       = v2version.parse_version_info("v201811.0123-beta", version_pattern)
+    patterns        = [
+        v2patterns.compile_pattern(version_pattern, '"{version}"'),
+        v2patterns.compile_pattern(version_pattern, "{pep440_version}"),
+    ]
+    old_lines = ['versions = ("v201809.0002-alpha", 201809.2a0)']
+    lines     = v2rewrite.rewrite_lines(patterns, new_vinfo, old_lines)
+    assert lines == ['versions = ("v201811.0123-beta", 201811.123b0)']
+
+
 def test_v1_rewrite_final():
     # Patterns written with {release_tag} placeholder preserve
     # the release tag even if the new version is -final
@@ -340,3 +356,74 @@ def test_remove_regex_chars():
     patterns        = [v2patterns.compile_pattern(version_pattern, '^__version__ = "{version}"')]
     lines           = v2rewrite.rewrite_lines(patterns, new_vinfo, ['__version__ = "2018.0002-alpha"   '])
     assert lines == ['__version__ = "2018.0123-beta"   ']
+
+
+def test_write_content(tmpdir):
+    path = tmpdir.join("setup.py")
+    path.write("__version__ = 'v201809.0001'\n")
+    path.chmod(0o750)
+    link = tmpdir.join("link.py")
+    link.mksymlinkto(path)
+
+    rewrite.write_content(str(link), "__version__ = 'v201809.0002'\r\n")
+
+    assert link.islink()
+    assert path.read_binary() == b"__version__ = 'v201809.0002'\r\n"
+    assert path.stat().mode & 0o777 == 0o750
+    assert sorted(p.basename for p in tmpdir.listdir()) == ["link.py", "setup.py"]
+
+
+def test_write_content_hardlink(tmpdir):
+    path = tmpdir.join("setup.py")
+    path.write("__version__ = 'v201809.0001'\n")
+    link = tmpdir.join("link.py")
+    os.link(str(path), str(link))
+
+    rewrite.write_content(str(path), "__version__ = 'v201809.0002'\n")
+
+    assert path.read_binary() == b"__version__ = 'v201809.0002'\n"
+    assert link.read_binary() == b"__version__ = 'v201809.0002'\n"
+    assert path.stat().ino == link.stat().ino
+
+
+def test_write_content_replace_fallback(tmpdir, monkeypatch):
+    path = tmpdir.join("setup.py")
+    path.write("__version__ = 'v201809.0001'\n")
+
+    def _replace(src, dst):
+        raise OSError(errno.EBUSY, "Device or resource busy")
+
+    monkeypatch.setattr(rewrite, '_replace', _replace)
+    rewrite.write_content(str(path), "__version__ = 'v201809.0002'\n")
+
+    assert path.read_binary() == b"__version__ = 'v201809.0002'\n"
+    assert [p.basename for p in tmpdir.listdir()] == ["setup.py"]
+
+
+def test_write_content_interrupted(tmpdir, monkeypatch):
+    path = tmpdir.join("setup.py")
+    path.write("__version__ = 'v201809.0001'\n")
+
+    def _replace(src, dst):
+        raise KeyboardInterrupt()
+
+    monkeypatch.setattr(rewrite, '_replace', _replace)
+    with pytest.raises(KeyboardInterrupt):
+        rewrite.write_content(str(path), "__version__ = 'v201809.0002'\n")
+
+    assert path.read_binary() == b"__version__ = 'v201809.0001'\n"
+    assert [p.basename for p in tmpdir.listdir()] == ["setup.py"]
+
+
+def test_v2_rewrite_files_skips_unchanged(tmpdir, monkeypatch):
+    path = tmpdir.join("setup.py")
+    path.write("__version__ = 'v201809.0002'\n")
+
+    version_pattern = "vYYYY0M.BUILD[-TAG]"
+    new_vinfo       = v2version.parse_version_info("v201809.0002", version_pattern)
+    patterns        = [v2patterns.compile_pattern(version_pattern, "__version__ = '{version}'")]
+
+    written = []
+    monkeypatch.setattr(rewrite, 'write_content', lambda path, content: written.append(path))
+    v2rewrite.rewrite_files({str(path): patterns}, new_vinfo)
+    assert written == []